@@ -13,8 +13,8 @@ general idea behind a Pratt parser:
 A few notes on the implementation.
 
 * All the nud/led tokens are on the Parser class itself, and are dispatched
-  using getattr().  This keeps all the parsing logic contained to a single
-  class.
+  through per-class tables built from the _token_nud_*/_token_led_* method
+  names.  This keeps all the parsing logic contained to a single class.
 * We use two passes through the data.  One to create a list of token,
   then one pass through the tokens to create the AST.  While the lexer actually
   yields tokens, we convert it to a list so we can easily implement two tokens
@@ -29,12 +29,40 @@ import random
 
 from jmespath import lexer
 from jmespath.compat import with_repr_method
+from jmespath.compat import get_methods
 from jmespath import ast
 from jmespath import exceptions
 from jmespath import visitor
 
 
-class Parser(object):
+# TreeInterpreter holds no per-search state, so a single instance is
+# shared by every search made with the default options.
+_DEFAULT_INTERPRETER = visitor.TreeInterpreter()
+
+
+class ParserRegistry(type):
+    def __init__(cls, name, bases, attrs):
+        cls._populate_token_tables()
+        super(ParserRegistry, cls).__init__(name, bases, attrs)
+
+    def _populate_token_tables(cls):
+        # Maps a token type to its _token_nud_<type>/_token_led_<type>
+        # method, so that dispatching on a token is a dict lookup rather
+        # than a string format + getattr().
+        nud_table = {}
+        led_table = {}
+        nud_prefix = '_token_nud_'
+        led_prefix = '_token_led_'
+        for name, method in get_methods(cls):
+            if name.startswith(nud_prefix):
+                nud_table[name[len(nud_prefix):]] = method
+            elif name.startswith(led_prefix):
+                led_table[name[len(led_prefix):]] = method
+        cls._NUD_TABLE = nud_table
+        cls._LED_TABLE = led_table
+
+
+class Parser(metaclass=ParserRegistry):
     BINDING_POWER = {
         'eof': 0,
         'unquoted_identifier': 0,
@@ -118,19 +146,19 @@ class Parser(object):
     def _expression(self, binding_power=0):
         left_token = self._lookahead_token(0)
         self._advance()
-        nud_function = getattr(
-            self, '_token_nud_%s' % left_token['type'],
-            self._error_nud_token)
-        left = nud_function(left_token)
+        nud_function = self._NUD_TABLE.get(left_token['type'])
+        if nud_function is None:
+            self._error_nud_token(left_token)
+        left = nud_function(self, left_token)
         current_token = self._current_token()
         while binding_power < self.BINDING_POWER[current_token]:
-            led = getattr(self, '_token_led_%s' % current_token, None)
+            led = self._LED_TABLE.get(current_token)
             if led is None:
                 error_token = self._lookahead_token(0)
                 self._error_led_token(error_token)
             else:
                 self._advance()
-                left = led(left)
+                left = led(self, left)
                 current_token = self._current_token()
         return left
 
@@ -500,11 +528,34 @@ class Parser(object):
 
 @with_repr_method
 class ParsedResult(object):
+    __slots__ = ('expression', 'parsed', '_compiled', '_repr')
+
     def __init__(self, expression, parsed):
         self.expression = expression
         self.parsed = parsed
+        self._compiled = None
+        self._repr = None
+
+    def __getstate__(self):
+        # The compiled form is made of closures, which can't be
+        # pickled.  It's rebuilt on the first search after unpickling.
+        return {'expression': self.expression, 'parsed': self.parsed}
+
+    def __setstate__(self, state):
+        self.expression = state['expression']
+        self.parsed = state['parsed']
+        self._compiled = None
+        self._repr = None
 
     def search(self, value, options=None):
+        if options is None:
+            # The default options are the common case, so the AST is
+            # compiled once and the compiled form is reused for every
+            # subsequent search.
+            if self._compiled is None:
+                compiler = visitor.TreeCompiler(_DEFAULT_INTERPRETER)
+                self._compiled = compiler.visit(self.parsed)
+            return self._compiled(value)
         interpreter = visitor.TreeInterpreter(options)
         result = interpreter.visit(self.parsed, value)
         return result
@@ -524,4 +575,8 @@ class ParsedResult(object):
         return contents
 
     def __repr__(self):
-        return repr(self.parsed)
+        # The AST isn't modified after parsing, so the (potentially
+        # large) repr only needs to be built once.
+        if self._repr is None:
+            self._repr = repr(self.parsed)
+        return self._repr
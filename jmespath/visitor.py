@@ -1,7 +1,9 @@
 import operator
+import functools
 
 from jmespath import functions
 from jmespath.compat import string_type
+from jmespath.compat import get_methods
 from numbers import Number
 
 
@@ -35,6 +37,32 @@ def _is_special_integer_case(x, y):
         return x is True or x is False
 
 
+def _merge_lists(base):
+    merged_list = []
+    extend = merged_list.extend
+    append = merged_list.append
+    for element in base:
+        if isinstance(element, list):
+            extend(element)
+        else:
+            append(element)
+    return merged_list
+
+
+def _get_values(base):
+    # Returns the values of an object, or None if base isn't one.
+    # Plain dicts, lists and None are checked directly so that only
+    # other types pay for raising and catching an AttributeError.
+    if type(base) is dict:
+        return base.values()
+    elif base is None or type(base) is list:
+        return None
+    try:
+        return base.values()
+    except AttributeError:
+        return None
+
+
 def _is_comparable(x):
     # The spec doesn't officially support string types yet,
     # but enough people are relying on this behavior that
@@ -72,6 +100,8 @@ class Options(object):
 
 
 class _Expression(object):
+    __slots__ = ('expression', 'interpreter')
+
     def __init__(self, expression, interpreter):
         self.expression = expression
         self.interpreter = interpreter
@@ -80,24 +110,61 @@ class _Expression(object):
         return self.interpreter.visit(node, *args, **kwargs)
 
 
-class Visitor(object):
-    def __init__(self):
-        self._method_cache = {}
+class VisitorRegistry(type):
+    def __init__(cls, name, bases, attrs):
+        cls._populate_visit_table()
+        super(VisitorRegistry, cls).__init__(name, bases, attrs)
+
+    def _populate_visit_table(cls):
+        # Maps a node type to its visit_<node type> method, so that
+        # visit() is a single dict lookup instead of a string format +
+        # getattr().
+        visit_table = {}
+        prefix = 'visit_'
+        for name, method in get_methods(cls):
+            if name.startswith(prefix):
+                visit_table[name[len(prefix):]] = method
+        cls._VISIT_TABLE = visit_table
 
+
+class Visitor(metaclass=VisitorRegistry):
     def visit(self, node, *args, **kwargs):
-        node_type = node['type']
-        method = self._method_cache.get(node_type)
+        method = self._VISIT_TABLE.get(node['type'])
         if method is None:
-            method = getattr(
-                self, 'visit_%s' % node['type'], self.default_visit)
-            self._method_cache[node_type] = method
-        return method(node, *args, **kwargs)
+            return self.default_visit(node, *args, **kwargs)
+        return method(self, node, *args, **kwargs)
 
     def default_visit(self, node, *args, **kwargs):
         raise NotImplementedError("default_visit")
 
 
-class TreeInterpreter(Visitor):
+class TreeInterpreterRegistry(VisitorRegistry):
+    def __init__(cls, name, bases, attrs):
+        super(TreeInterpreterRegistry, cls).__init__(name, bases, attrs)
+        cls._populate_inline_flags()
+
+    def _populate_inline_flags(cls):
+        # Some hot paths resolve nodes inline instead of dispatching to
+        # their visit_<node type>() method.  That's only done when
+        # neither those methods nor visit() itself have been overridden
+        # by a subclass, otherwise the override would be skipped.
+        # The base class is the first in the MRO using this metaclass.
+        base = [klass for klass in cls.__mro__
+                if isinstance(klass, TreeInterpreterRegistry)][-1]
+        base_table = base._VISIT_TABLE
+        visit_table = cls._VISIT_TABLE
+
+        def inherits(node_type):
+            return visit_table.get(node_type) is base_table.get(node_type)
+
+        dispatches = cls.visit is Visitor.visit
+        cls._INLINE_FIELD = dispatches and inherits('field')
+        cls._INLINE_KEY_VAL_PAIR = (
+            dispatches and inherits('field') and inherits('key_val_pair'))
+        cls._INLINE_INDEX = dispatches and inherits('index')
+
+
+class TreeInterpreter(Visitor, metaclass=TreeInterpreterRegistry):
     COMPARATOR_FUNC = {
         'eq': _equals,
         'ne': lambda x, y: not _equals(x, y),
@@ -108,7 +175,6 @@ class TreeInterpreter(Visitor):
     }
     _EQUALITY_OPS = ['eq', 'ne']
     MAP_TYPE = dict
-
     def __init__(self, options=None):
         super(TreeInterpreter, self).__init__()
         self._dict_cls = self.MAP_TYPE
@@ -126,12 +192,25 @@ class TreeInterpreter(Visitor):
         raise NotImplementedError(node['type'])
 
     def visit_subexpression(self, node, value):
+        # The parser already flattens "a.b.c.d" into a single
+        # subexpression node, so the common case is a run of field
+        # children.  Those are resolved inline rather than paying
+        # for a dispatch + visit_field() call per field.
         result = value
-        for node in node['children']:
-            result = self.visit(node, result)
+        inline_field = self._INLINE_FIELD
+        for child in node['children']:
+            if inline_field and child['type'] == 'field':
+                try:
+                    result = result.get(child['value'])
+                except AttributeError:
+                    result = None
+            else:
+                result = self.visit(child, result)
         return result
 
     def visit_field(self, node, value):
+        if value is None:
+            return None
         try:
             return value.get(node['value'])
         except AttributeError:
@@ -175,26 +254,16 @@ class TreeInterpreter(Visitor):
         if not isinstance(base, list):
             return None
         comparator_node = node['children'][2]
-        collected = []
-        for element in base:
-            if self._is_true(self.visit(comparator_node, element)):
-                current = self.visit(node['children'][1], element)
-                if current is not None:
-                    collected.append(current)
-        return collected
+        matched = [element for element in base
+                   if self._is_true(self.visit(comparator_node, element))]
+        return self._project(node['children'][1], matched)
 
     def visit_flatten(self, node, value):
         base = self.visit(node['children'][0], value)
         if not isinstance(base, list):
             # Can't flatten the object if it's not a list.
             return None
-        merged_list = []
-        for element in base:
-            if isinstance(element, list):
-                merged_list.extend(element)
-            else:
-                merged_list.append(element)
-        return merged_list
+        return _merge_lists(base)
 
     def visit_identity(self, node, value):
         return value
@@ -210,9 +279,20 @@ class TreeInterpreter(Visitor):
             return None
 
     def visit_index_expression(self, node, value):
+        # Indexing into a plain list is by far the most common case,
+        # so it's handled inline instead of dispatching to
+        # visit_index().
         result = value
-        for node in node['children']:
-            result = self.visit(node, result)
+        inline_index = self._INLINE_INDEX
+        for child in node['children']:
+            if (inline_index and child['type'] == 'index' and
+                    type(result) is list):
+                try:
+                    result = result[child['value']]
+                except IndexError:
+                    result = None
+            else:
+                result = self.visit(child, result)
         return result
 
     def visit_slice(self, node, value):
@@ -231,8 +311,15 @@ class TreeInterpreter(Visitor):
         if value is None:
             return None
         collected = self._dict_cls()
+        is_dict = self._INLINE_KEY_VAL_PAIR and type(value) is dict
         for child in node['children']:
-            collected[child['value']] = self.visit(child, value)
+            expression = child['children'][0]
+            if is_dict and expression['type'] == 'field':
+                # Common case "{a: a, b: b}", skip the key_val_pair and
+                # field dispatch.
+                collected[child['value']] = value.get(expression['value'])
+            else:
+                collected[child['value']] = self.visit(child, value)
         return collected
 
     def visit_multi_select_list(self, node, value):
@@ -273,37 +360,376 @@ class TreeInterpreter(Visitor):
         base = self.visit(node['children'][0], value)
         if not isinstance(base, list):
             return None
-        collected = []
-        for element in base:
-            current = self.visit(node['children'][1], element)
-            if current is not None:
-                collected.append(current)
-        return collected
+        return self._project(node['children'][1], base)
 
     def visit_value_projection(self, node, value):
-        base = self.visit(node['children'][0], value)
-        try:
-            base = base.values()
-        except AttributeError:
+        base = _get_values(self.visit(node['children'][0], value))
+        if base is None:
             return None
-        collected = []
-        for element in base:
-            current = self.visit(node['children'][1], element)
-            if current is not None:
-                collected.append(current)
-        return collected
+        return self._project(node['children'][1], base)
+
+    def _project(self, right, elements):
+        if self._INLINE_FIELD and right['type'] == 'field':
+            # Common case "foo[*].bar", where the elements are almost
+            # always dicts.  Those are looked up directly, anything
+            # else goes through the usual visit_field() path.
+            key = right['value']
+            collected = []
+            for element in elements:
+                if type(element) is dict:
+                    current = element.get(key)
+                else:
+                    current = self.visit(right, element)
+                if current is not None:
+                    collected.append(current)
+            return collected
+        return [current for current in
+                (self.visit(right, element) for element in elements)
+                if current is not None]
 
     def _is_false(self, value):
         # This looks weird, but we're explicitly using equality checks
         # because the truth/false values are different between
         # python and jmespath.
-        return (value == '' or value == [] or value == {} or value is None or
-                value is False)
+        # The identity checks are cheapest, so they're done first.
+        return (value is None or value is False or value == '' or
+                value == [] or value == {})
 
     def _is_true(self, value):
         return not self._is_false(value)
 
 
+class TreeCompiler(Visitor):
+    """Compile an AST into a python callable.
+
+    The AST is immutable once parsed, so rather than dispatching on
+    every node each time an expression is searched, the tree is walked
+    once and each node is turned into a closure over its (already
+    compiled) children.  The returned callable accepts a single value
+    and returns the same result as ``interpreter.visit(node, value)``.
+
+    Node types that don't have a ``visit_<node type>`` method here are
+    delegated to ``interpreter``.
+
+    """
+    def __init__(self, interpreter):
+        self._interpreter = interpreter
+
+    def default_visit(self, node):
+        return functools.partial(self._interpreter.visit, node)
+
+    def visit_field(self, node):
+        key = node['value']
+
+        def field(value):
+            # A missing key earlier in an expression means None is
+            # the most common non-dict value seen here.  Checking
+            # for it up front avoids raising and catching an
+            # AttributeError for every remaining field.
+            if value is None:
+                return None
+            try:
+                return value.get(key)
+            except AttributeError:
+                return None
+        return field
+
+    def visit_subexpression(self, node):
+        return self._compile_chain(node['children'])
+
+    def visit_index_expression(self, node):
+        return self._compile_chain(node['children'])
+
+    def visit_pipe(self, node):
+        return self._compile_chain(node['children'])
+
+    def visit_index(self, node):
+        index = node['value']
+
+        def index_(value):
+            # Even though we can index strings, we don't
+            # want to support that.
+            if not isinstance(value, list):
+                return None
+            try:
+                return value[index]
+            except IndexError:
+                return None
+        return index_
+
+    def visit_identity(self, node):
+        return _identity
+
+    def visit_current(self, node):
+        return _identity
+
+    def visit_literal(self, node):
+        literal = node['value']
+
+        def literal_(value):
+            return literal
+        return literal_
+
+    def visit_key_val_pair(self, node):
+        return self.visit(node['children'][0])
+
+    def visit_multi_select_dict(self, node):
+        keys = tuple(child['value'] for child in node['children'])
+        compiled = [self.visit(child) for child in node['children']]
+        dict_cls = self._interpreter._dict_cls
+        expressions = [child['children'][0] for child in node['children']]
+        if all(expression['type'] == 'field' for expression in expressions):
+            names = tuple(expression['value'] for expression in expressions)
+
+            def multi_select_fields(value):
+                if value is None:
+                    return None
+                if type(value) is dict:
+                    return dict_cls(zip(keys, map(value.get, names)))
+                return dict_cls(zip(keys, [func(value) for func in compiled]))
+            return multi_select_fields
+
+        def multi_select_dict(value):
+            if value is None:
+                return None
+            return dict_cls(zip(keys, [func(value) for func in compiled]))
+        return multi_select_dict
+
+    def visit_multi_select_list(self, node):
+        compiled = [self.visit(child) for child in node['children']]
+
+        def multi_select_list(value):
+            if value is None:
+                return None
+            return [func(value) for func in compiled]
+        return multi_select_list
+
+    def visit_projection(self, node):
+        left = self.visit(node['children'][0])
+        project = self._compile_project(node['children'][1])
+
+        def projection(value):
+            base = left(value)
+            if not isinstance(base, list):
+                return None
+            return project(base)
+        return projection
+
+    def visit_value_projection(self, node):
+        left = self.visit(node['children'][0])
+        project = self._compile_project(node['children'][1])
+
+        def value_projection(value):
+            base = _get_values(left(value))
+            if base is None:
+                return None
+            return project(base)
+        return value_projection
+
+    def visit_filter_projection(self, node):
+        left = self.visit(node['children'][0])
+        project = self._compile_project(node['children'][1])
+        comparator = self.visit(node['children'][2])
+        is_true = self._interpreter._is_true
+
+        def filter_projection(value):
+            base = left(value)
+            if not isinstance(base, list):
+                return None
+            return project([element for element in base
+                            if is_true(comparator(element))])
+        return filter_projection
+
+    def visit_flatten(self, node):
+        left = self.visit(node['children'][0])
+
+        def flatten(value):
+            base = left(value)
+            if not isinstance(base, list):
+                # Can't flatten the object if it's not a list.
+                return None
+            return _merge_lists(base)
+        return flatten
+
+    def visit_comparator(self, node):
+        comparator_func = self._interpreter.COMPARATOR_FUNC[node['value']]
+        left = self.visit(node['children'][0])
+        right = self.visit(node['children'][1])
+        if node['value'] in self._interpreter._EQUALITY_OPS:
+            def equality(value):
+                return comparator_func(left(value), right(value))
+            return equality
+
+        def ordering(value):
+            # Ordering operators are only valid for numbers.
+            # Evaluating any other type with a comparison operator
+            # will yield a None value.
+            left_value = left(value)
+            right_value = right(value)
+            if not (_is_comparable(left_value) and
+                    _is_comparable(right_value)):
+                return None
+            return comparator_func(left_value, right_value)
+        return ordering
+
+    def visit_not_expression(self, node):
+        expression = self.visit(node['children'][0])
+
+        def not_expression(value):
+            original_result = expression(value)
+            if type(original_result) is int and original_result == 0:
+                # Special case for 0, !0 should be false, not true.
+                # 0 is not a special cased integer in jmespath.
+                return False
+            return not original_result
+        return not_expression
+
+    def visit_or_expression(self, node):
+        left_node, right_node = node['children']
+        left = self.visit(left_node)
+        right = self.visit(right_node)
+        is_false = self._interpreter._is_false
+        if left_node['type'] == 'field' and right_node['type'] == 'field':
+            # Common case "foo || bar", both lookups are done directly
+            # when the value is a dict.
+            left_key = left_node['value']
+            right_key = right_node['value']
+
+            def or_fields(value):
+                if type(value) is not dict:
+                    matched = left(value)
+                    if is_false(matched):
+                        matched = right(value)
+                    return matched
+                matched = value.get(left_key)
+                if is_false(matched):
+                    matched = value.get(right_key)
+                return matched
+            return or_fields
+
+        def or_expression(value):
+            matched = left(value)
+            if is_false(matched):
+                matched = right(value)
+            return matched
+        return or_expression
+
+    def visit_and_expression(self, node):
+        left = self.visit(node['children'][0])
+        right = self.visit(node['children'][1])
+        is_false = self._interpreter._is_false
+
+        def and_expression(value):
+            matched = left(value)
+            if is_false(matched):
+                return matched
+            return right(value)
+        return and_expression
+
+    def _compile_project(self, node):
+        # Returns a callable that applies the right hand side of a
+        # projection to every element and drops the None results.
+        right = self.visit(node)
+        if node['type'] == 'field':
+            # For "foo[*].bar" the elements are almost always dicts,
+            # which we know at compile time, so the field lookup is
+            # inlined instead of calling the compiled field per element.
+            key = node['value']
+
+            def project_field(elements):
+                collected = []
+                for element in elements:
+                    if type(element) is dict:
+                        current = element.get(key)
+                    else:
+                        current = right(element)
+                    if current is not None:
+                        collected.append(current)
+                return collected
+            return project_field
+        elif self._is_plain_index(node):
+            # "foo[*][0]", typically a list of rows.  List elements are
+            # indexed directly instead of going through the compiled
+            # index_expression for each row.
+            index = node['children'][1]['value']
+
+            def project_index(elements):
+                collected = []
+                for element in elements:
+                    if type(element) is list:
+                        try:
+                            current = element[index]
+                        except IndexError:
+                            continue
+                    else:
+                        current = right(element)
+                    if current is not None:
+                        collected.append(current)
+                return collected
+            return project_index
+
+        def project(elements):
+            return [current for current in map(right, elements)
+                    if current is not None]
+        return project
+
+    def _is_plain_index(self, node):
+        # The parser emits "[0]" as index_expression(identity, index).
+        children = node['children']
+        return (node['type'] == 'index_expression' and
+                len(children) == 2 and
+                children[0]['type'] == 'identity' and
+                children[1]['type'] == 'index')
+
+    def _compile_chain(self, children):
+        # Consecutive field children ("a.b.c.d") are compiled into a
+        # single lookup over a tuple of keys rather than one closure
+        # per field.
+        compiled = []
+        fields = []
+        for child in children:
+            if child['type'] == 'field':
+                fields.append(child)
+                continue
+            if fields:
+                compiled.append(self._compile_fields(fields))
+                fields = []
+            compiled.append(self.visit(child))
+        if fields:
+            compiled.append(self._compile_fields(fields))
+        if len(compiled) == 1:
+            return compiled[0]
+
+        def chain(value):
+            for func in compiled:
+                value = func(value)
+            return value
+        return chain
+
+    def _compile_fields(self, fields):
+        if len(fields) == 1:
+            return self.visit(fields[0])
+        return _compile_field_path(tuple(field['value'] for field in fields))
+
+
+def _identity(value):
+    return value
+
+
+def _compile_field_path(keys):
+    def field_path(value):
+        for key in keys:
+            # Once a key is missing every remaining lookup is None.
+            if value is None:
+                return None
+            try:
+                value = value.get(key)
+            except AttributeError:
+                return None
+        return value
+    return field_path
+
+
 class GraphvizVisitor(Visitor):
     def __init__(self):
         super(GraphvizVisitor, self).__init__()
@@ -13,6 +13,11 @@ COMPLIANCE_DIR = os.path.join(TEST_DIR, 'compliance')
 LEGACY_DIR = os.path.join(TEST_DIR, 'legacy')
 NOT_SPECIFIED = object()
 OPTIONS = Options(dict_cls=OrderedDict)
+# Searching with the default options uses the compiled form of an
+# expression while explicit options go through the TreeInterpreter,
+# so every case is run against both.
+SEARCH_OPTIONS = pytest.mark.parametrize(
+    'options', [None, OPTIONS], ids=['compiled', 'interpreted'])
 
 
 def _compliance_tests(requested_test_type):
@@ -63,11 +68,12 @@ def load_cases(full_path):
             yield (given, test_type, case)
 
 
+@SEARCH_OPTIONS
 @pytest.mark.parametrize(
     'given, expression, expected, filename',
     _compliance_tests('result')
 )
-def test_expression(given, expression, expected, filename):
+def test_expression(given, expression, expected, filename, options):
     import jmespath.parser
     try:
         parsed = jmespath.compile(expression)
@@ -75,7 +81,7 @@ def test_expression(given, expression, expected, filename):
         raise AssertionError(
             'jmespath expression failed to compile: "%s", error: %s"' %
             (expression, e))
-    actual = parsed.search(given, options=OPTIONS)
+    actual = parsed.search(given, options=options)
     expected_repr = json.dumps(expected, indent=4)
     actual_repr = json.dumps(actual, indent=4)
     error_msg = ("\n\n  (%s) The expression '%s' was suppose to give:\n%s\n"
@@ -87,18 +93,19 @@ def test_expression(given, expression, expected, filename):
     assert actual == expected, error_msg
 
 
+@SEARCH_OPTIONS
 @pytest.mark.parametrize(
     'given, expression, error, filename',
     _compliance_tests('error')
 )
-def test_error_expression(given, expression, error, filename):
+def test_error_expression(given, expression, error, filename, options):
     import jmespath.parser
     if error not in ('syntax', 'invalid-type',
                      'unknown-function', 'invalid-arity', 'invalid-value'):
         raise RuntimeError("Unknown error type '%s'" % error)
     try:
         parsed = jmespath.compile(expression)
-        parsed.search(given)
+        parsed.search(given, options=options)
     except ValueError:
         # Test passes, it raised a parse error as expected.
         pass
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 import re
+import pickle
 import random
 import string
 import threading
@@ -36,6 +37,12 @@ class TestParser(unittest.TestCase):
         self.assertEqual(
             parsed.search({'foo': {'bar': {'baz': 'correct'}}}), 'correct')
 
+    def test_multiple_dots_with_non_dict_values(self):
+        parsed = self.parser.parse('foo.bar.baz')
+        self.assertIsNone(parsed.search({'foo': {'bar': 'not-a-dict'}}))
+        self.assertIsNone(parsed.search({'foo': ['bar']}))
+        self.assertIsNone(parsed.search({'foo': None}))
+
     def test_index(self):
         parsed = self.parser.parse('foo[1]')
         self.assertEqual(
@@ -60,6 +67,12 @@ class TestParser(unittest.TestCase):
             parsed.search({'foo': [{'bar': 'one'}, {'bar': 'two'}]}),
             ['one', 'two'])
 
+    def test_wildcard_with_mixed_element_types(self):
+        parsed = self.parser.parse('foo[*].bar')
+        data = {'foo': [{'bar': 'one'}, 'notdict', None,
+                        OrderedDict([('bar', 'two')]), {'baz': 'three'}]}
+        self.assertEqual(parsed.search(data), ['one', 'two'])
+
     def test_or_expression(self):
         parsed = self.parser.parse('foo || bar')
         self.assertEqual(parsed.search({'foo': 'foo'}), 'foo')
@@ -294,6 +307,23 @@ class TestMergedLists(unittest.TestCase):
              ["nine"], ["ten"]])
 
 
+class TestParserSubclass(unittest.TestCase):
+    def test_subclass_token_handlers_are_dispatched(self):
+        class UppercaseFieldParser(parser.Parser):
+            _CACHE = {}
+
+            def _token_nud_unquoted_identifier(self, token):
+                return ast.field(token['value'].upper())
+
+        parsed = UppercaseFieldParser().parse('foo.bar')
+        self.assertEqual(parsed.parsed,
+                         ast.subexpression([ast.field('FOO'),
+                                            ast.field('BAR')]))
+        # The base class tables are left untouched.
+        self.assertEqual(parser.Parser().parse('foo').parsed,
+                         ast.field('foo'))
+
+
 class TestParserCaching(unittest.TestCase):
     def test_compile_lots_of_expressions(self):
         # We have to be careful here because this is an implementation detail
@@ -356,6 +386,13 @@ class TestParserAddsExpressionAttribute(unittest.TestCase):
         self.assertEqual(parsed.expression, 'foo.bar')
 
 
+class TestParsedResultRepr(unittest.TestCase):
+    def test_repr_is_repr_of_ast(self):
+        parsed = parser.Parser().parse('foo.bar')
+        self.assertEqual(repr(parsed), repr(parsed.parsed))
+        self.assertIs(repr(parsed), repr(parsed))
+
+
 class TestParsedResultAddsOptions(unittest.TestCase):
     def test_can_have_ordered_dict(self):
         p = parser.Parser()
@@ -368,6 +405,170 @@ class TestParsedResultAddsOptions(unittest.TestCase):
         self.assertEqual(list(result), ['a', 'b', 'c'])
 
 
+class TestTreeInterpreterSubclass(unittest.TestCase):
+    def test_subclass_visit_methods_are_dispatched(self):
+        class UppercaseInterpreter(visitor.TreeInterpreter):
+            def visit_literal(self, node, value):
+                return node['value'].upper()
+
+        parsed = parser.Parser().parse('`"foo"`')
+        interpreter = UppercaseInterpreter()
+        self.assertEqual(interpreter.visit(parsed.parsed, {}), 'FOO')
+        # The base class dispatch table is left untouched.
+        self.assertEqual(parsed.search({}), 'foo')
+
+    def assert_uppercase_field_result(self, expression, data, expected):
+        class UppercaseFieldInterpreter(visitor.TreeInterpreter):
+            def visit_field(self, node, value):
+                result = super(UppercaseFieldInterpreter, self).visit_field(
+                    node, value)
+                if isinstance(result, str):
+                    return result.upper()
+                return result
+
+        parsed = parser.Parser().parse(expression)
+        interpreter = UppercaseFieldInterpreter()
+        self.assertEqual(interpreter.visit(parsed.parsed, data), expected)
+
+    def test_visit_field_override_used_in_subexpression(self):
+        self.assert_uppercase_field_result('a.foo', {'a': {'foo': 'y'}}, 'Y')
+
+    def test_visit_field_override_used_in_projection(self):
+        self.assert_uppercase_field_result(
+            'l[*].foo', {'l': [{'foo': 'z'}]}, ['Z'])
+        self.assert_uppercase_field_result(
+            'l[?foo].foo', {'l': [{'foo': 'z'}]}, ['Z'])
+
+    def test_visit_field_override_used_in_multi_select_dict(self):
+        self.assert_uppercase_field_result('{x: foo}', {'foo': 'x'},
+                                           {'x': 'X'})
+
+    def test_visit_key_val_pair_override_used(self):
+        class KeyValPairInterpreter(visitor.TreeInterpreter):
+            def visit_key_val_pair(self, node, value):
+                return 'kvp'
+
+        parsed = parser.Parser().parse('{x: foo}')
+        interpreter = KeyValPairInterpreter()
+        self.assertEqual(interpreter.visit(parsed.parsed, {'foo': 'x'}),
+                         {'x': 'kvp'})
+
+    def test_visit_index_override_used_in_index_expression(self):
+        class ReversedIndexInterpreter(visitor.TreeInterpreter):
+            def visit_index(self, node, value):
+                return value[-1 - node['value']]
+
+        parsed = parser.Parser().parse('foo[0]')
+        interpreter = ReversedIndexInterpreter()
+        self.assertEqual(interpreter.visit(parsed.parsed, {'foo': [1, 2]}), 2)
+
+    def test_visit_override_sees_every_node(self):
+        class TracingInterpreter(visitor.TreeInterpreter):
+            def __init__(self):
+                super(TracingInterpreter, self).__init__()
+                self.visited = []
+
+            def visit(self, node, *args, **kwargs):
+                self.visited.append(node['type'])
+                return super(TracingInterpreter, self).visit(
+                    node, *args, **kwargs)
+
+        cases = [
+            ('a.b', {'a': {'b': 1}}, ['subexpression', 'field', 'field']),
+            ('foo[*].bar', {'foo': [{'bar': 1}]},
+             ['projection', 'field', 'field']),
+            ('x[0]', {'x': [1]}, ['index_expression', 'field', 'index']),
+            ('{k: a}', {'a': 1},
+             ['multi_select_dict', 'key_val_pair', 'field']),
+        ]
+        for expression, data, expected in cases:
+            with self.subTest(expression=expression):
+                interpreter = TracingInterpreter()
+                parsed = parser.Parser().parse(expression)
+                interpreter.visit(parsed.parsed, data)
+                self.assertEqual(interpreter.visited, expected)
+
+    def test_unknown_node_type_uses_default_visit(self):
+        with self.assertRaises(NotImplementedError):
+            visitor.TreeInterpreter().visit({'type': 'unknown'}, {})
+
+
+class _ListSubclass(list):
+    pass
+
+
+class _Mapping(object):
+    # A non-dict object that provides the methods the interpreter
+    # duck types on.
+    def __init__(self, data):
+        self._data = data
+
+    def get(self, key):
+        return self._data.get(key)
+
+    def values(self):
+        return self._data.values()
+
+
+class TestParsedResultCompilation(unittest.TestCase):
+    # The compliance suite runs every case through both the compiled
+    # and interpreted paths.  These cover the python specific inputs
+    # it can't express: non-dict mappings and list subclasses, which
+    # skip the type() based fast paths.
+    def setUp(self):
+        self.data = {
+            'ordered': OrderedDict([('a', 'a'), ('b', ''), ('c', 'c')]),
+            'mapping': _Mapping({'a': 'a', 'b': {'c': 'c'}}),
+            'sublist': _ListSubclass([_ListSubclass([1, 2]), [3], 4]),
+            'mappings': [_Mapping({'a': 1}), OrderedDict([('a', 2)]),
+                         {'a': 3}, 'str', None],
+        }
+
+    def assert_compiled_matches_interpreter(self, expression):
+        parsed = parser.Parser().parse(expression)
+        interpreted = visitor.TreeInterpreter().visit(parsed.parsed,
+                                                      self.data)
+        compiled = visitor.TreeCompiler(
+            visitor.TreeInterpreter()).visit(parsed.parsed)
+        self.assertEqual(compiled(self.data), interpreted)
+
+    def test_compiled_matches_interpreter(self):
+        expressions = [
+            'ordered.a', 'mapping.a', 'mapping.b.c', 'ordered.*',
+            'mapping.*', 'ordered.{x: a, y: c}', 'mapping.{x: a, y: b.c}',
+            'ordered.b || ordered.c', 'mapping.missing || mapping.a',
+            'mappings[*].a', 'mappings[?a > `1`].a', 'sublist[0]',
+            'sublist[0][1]', 'sublist[*][0]', 'sublist[]', 'sublist[][]',
+        ]
+        for expression in expressions:
+            with self.subTest(expression=expression):
+                self.assert_compiled_matches_interpreter(expression)
+
+    def test_can_pickle_after_search(self):
+        parsed = parser.Parser().parse('foo.bar')
+        self.assertEqual(parsed.search({'foo': {'bar': 1}}), 1)
+        unpickled = pickle.loads(pickle.dumps(parsed))
+        self.assertEqual(unpickled.expression, 'foo.bar')
+        self.assertEqual(unpickled.parsed, parsed.parsed)
+        self.assertEqual(unpickled.search({'foo': {'bar': 2}}), 2)
+
+    def test_compiled_form_is_reused(self):
+        parsed = parser.Parser().parse('foo.bar')
+        self.assertEqual(parsed.search({'foo': {'bar': 1}}), 1)
+        compiled = parsed._compiled
+        self.assertEqual(parsed.search({'foo': {'bar': 2}}), 2)
+        self.assertIs(parsed._compiled, compiled)
+
+    def test_compiled_multi_select_dict_uses_dict_cls(self):
+        parsed = parser.Parser().parse('{c: c, b: b, a: a}')
+        interpreter = visitor.TreeInterpreter(
+            visitor.Options(dict_cls=OrderedDict))
+        compiled = visitor.TreeCompiler(interpreter).visit(parsed.parsed)
+        result = compiled({'a': 1, 'b': 2, 'c': 3})
+        self.assertIsInstance(result, OrderedDict)
+        self.assertEqual(list(result.items()), [('c', 3), ('b', 2), ('a', 1)])
+
+
 class TestRenderGraphvizFile(unittest.TestCase):
     def test_dot_file_rendered(self):
         p = parser.Parser()